@@ -0,0 +1,60 @@
+"""
+Re-serialize the Stuff+ model as a protocol-5 pickle.
+
+The shipped model is a dill pickle, which is slow to load on every worker start.
+This loads it once with dill and writes a plain pickle (protocol 5) next to it;
+main.load_stuff_plus_model picks up the .pkl5 automatically and falls back to
+dill when it is missing or older than the source file.
+
+With --onnx it also exports the booster to <model>.onnx (needs onnxmltools), which
+main serves through onnxruntime when that package is installed.
+
+Usage:
+    python convert_model.py [--onnx] [path/to/model.pkl]
+"""
+
+import os
+import pickle
+import sys
+import warnings
+
+import dill
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BACKEND_DIR)
+# The protocol-5 pickle references this class by name instead of embedding a copy of it.
+from modeling.aStuffPlusModel2 import aStuffPlusModel  # noqa: E402
+
+DEFAULT_MODEL_PATH = os.environ.get(
+    "STUFF_PLUS_MODEL_PATH",
+    os.path.join(BACKEND_DIR, "stuff_plus_model2020_2025_2.pkl"),
+)
+
+
+def convert(src_path: str, onnx: bool = False) -> str:
+    """Load src_path with dill and dump it as protocol 5 to <src_path stem>.pkl5. Returns the output path."""
+    dill._dill._reverse_typemap[
+        "modeling.aStuffPlusModel.aStuffPlusModel"
+    ] = "modeling.aStuffPlusModel2.aStuffPlusModel"
+    with open(src_path, "rb") as f, warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model = aStuffPlusModel.from_pickled(dill.load(f))
+
+    dst_path = os.path.splitext(src_path)[0] + ".pkl5"
+    tmp_path = dst_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, dst_path)
+    if onnx:
+        onnx_path = os.path.splitext(src_path)[0] + ".onnx"
+        model.export_onnx(onnx_path)
+        print(f"Wrote {onnx_path}")
+    return dst_path
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    onnx = "--onnx" in args
+    args = [a for a in args if a != "--onnx"]
+    src = args[0] if args else DEFAULT_MODEL_PATH
+    print(f"Wrote {convert(src, onnx=onnx)}")
@@ -8,33 +8,44 @@ FastAPI server with:
 
 Usage:
     uvicorn main:app --host 0.0.0.0 --port 8000 --reload
+
+Production (see Dockerfile):
+    gunicorn main:app -k uvicorn_worker.UvicornWorker --workers $WEB_CONCURRENCY --bind 0.0.0.0:$PORT
 """
 
-from fastapi import FastAPI, HTTPException, Depends, File, Request, UploadFile, Form
+from fastapi import FastAPI, HTTPException, Depends, File, Request, Response, UploadFile, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Literal, Optional, get_args
 import numpy as np
+import orjson
+import anyio.to_thread
 import dill
+import pickle
 import warnings
 import os
 import sys
 import sqlite3
+import threading
 import json
+import math
 import csv
 import io
+import secrets
 import tempfile
-import uuid
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
 from datetime import datetime, timedelta, timezone
 from contextlib import contextmanager
+from functools import lru_cache
 
 from trackman_parser import _spin_axis_from_movement, parse_trackman_pdf, parse_pitcher_hand_from_pdf
 
-from jose import jwt, JWTError
+import jwt
+from jwt import InvalidTokenError as JWTError
 import bcrypt
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -81,20 +92,50 @@ GRANDFATHERED_EMAILS = {
 def _is_grandfathered(email: Optional[str]) -> bool:
     return bool(email) and email.strip().lower() in GRANDFATHERED_EMAILS
 
+
+def _new_id() -> str:
+    """128-bit random hex id for users, profiles and pitches (cheaper than formatting a uuid4)."""
+    return secrets.token_hex(16)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
 # CORS allowed origins
 ALLOWED_ORIGINS = os.environ.get("CORS_ORIGINS", "*").split(",")
 
+# bcrypt work factor for new hashes (12 is bcrypt's own default, used for every existing account).
+# Hashes at another cost are rehashed on the next successful login so they match the login dummy's timing.
+BCRYPT_COST = int(os.environ.get("BCRYPT_COST", "12"))
+# Worker threads for sync endpoints and dependencies, which is where all SQLite and bcrypt work runs (anyio default is 40).
+THREADPOOL_SIZE = int(os.environ.get("THREADPOOL_SIZE", "100"))
+# SQLite page cache per pooled connection, in KiB. Every thread keeps its own connection, so a worker
+# can hold up to THREADPOOL_SIZE times this; the default matches SQLite's own 2 MB.
+SQLITE_CACHE_KB = int(os.environ.get("SQLITE_CACHE_KB", "2000"))
+
 security = HTTPBearer()
 limiter = Limiter(key_func=get_remote_address, default_limits=["1000/hour"])
 
 
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(BCRYPT_COST)).decode("utf-8")
 
 
 def verify_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
 
+
+def _bcrypt_cost(hashed: str) -> Optional[int]:
+    # Modular crypt format: $2b$<cost>$<salt+hash>. None for anything else, so login never fails on it.
+    try:
+        return int(hashed.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+# Checked against on login when the email is unknown, so both paths cost one bcrypt verify at BCRYPT_COST.
+DUMMY_PASSWORD_HASH = hash_password(_new_id())
+
 # Database path: use explicit DATABASE_PATH if set, else Railway volume, else local
 # For Railway: set DATABASE_PATH=/data/livedata.db and mount volume at /data
 _db_explicit = os.environ.get("DATABASE_PATH")
@@ -183,77 +224,148 @@ def init_db():
         """)
         conn.commit()
     migrate_db()
+    # Indexes come after migrate_db so legacy DBs already have pitches.profile_id.
+    # users.email needs none: its UNIQUE constraint is backed by an automatic index.
+    with get_db() as conn:
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_pitches_user_profile_created "
+            "ON pitches(user_id, profile_id, created_at DESC)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_pitches_user_type_created "
+            "ON pitches(user_id, pitch_type, created_at DESC)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_profiles_user_created "
+            "ON profiles(user_id, created_at)"
+        )
+        conn.execute("ANALYZE")
+        conn.commit()
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> set:
+    return {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
 
 
 def migrate_db():
     """Add new columns/tables and migrate existing data for existing deployments."""
     with get_db() as conn:
-        # Add account_type to users if missing (existing DBs)
-        try:
-            conn.execute("ALTER TABLE users ADD COLUMN account_type TEXT DEFAULT 'personal'")
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-
-        # Add profile_id to pitches if missing
-        try:
-            conn.execute("ALTER TABLE pitches ADD COLUMN profile_id TEXT")
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass
-
-        for col, default in [
-            ("subscription_status", "'none'"),
-            ("subscription_plan", "NULL"),
-            ("subscription_expires_at", "NULL"),
-            ("revenuecat_app_user_id", "NULL"),
-            ("subscription_product_id", "NULL"),
+        # Add columns missing from older DBs. Checked up front so a normal startup issues no ALTER, but
+        # another worker may add the same column between the check and the ALTER, so tolerate that.
+        user_cols = _table_columns(conn, "users")
+        for col, decl in [
+            ("account_type", "TEXT DEFAULT 'personal'"),
+            ("subscription_status", "TEXT DEFAULT 'none'"),
+            ("subscription_plan", "TEXT DEFAULT NULL"),
+            ("subscription_expires_at", "TEXT DEFAULT NULL"),
+            ("revenuecat_app_user_id", "TEXT DEFAULT NULL"),
+            ("subscription_product_id", "TEXT DEFAULT NULL"),
         ]:
-            try:
-                conn.execute(f"ALTER TABLE users ADD COLUMN {col} TEXT DEFAULT {default}")
-                conn.commit()
-            except sqlite3.OperationalError:
-                pass
+            if col not in user_cols:
+                try:
+                    conn.execute(f"ALTER TABLE users ADD COLUMN {col} {decl}")
+                except sqlite3.OperationalError:
+                    pass  # Column already exists
+
+        pitch_cols = _table_columns(conn, "pitches")
+        for col, decl in [
+            ("profile_id", "TEXT"),
+            ("source", "TEXT DEFAULT 'manual'"),
+        ]:
+            if col not in pitch_cols:
+                try:
+                    conn.execute(f"ALTER TABLE pitches ADD COLUMN {col} {decl}")
+                except sqlite3.OperationalError:
+                    pass  # Column already exists
+        conn.commit()
 
-        # Add source column to pitches
+        # Migrate: for users with no profile, create one and assign pitches (existing users → personal).
+        # Set-based so startup cost doesn't grow with the number of users.
+        # The connection is long-lived, so drop the temp table even if a step fails and clear any
+        # leftover from an earlier failed run before recreating it.
+        now = _now_iso()
+        conn.execute("DROP TABLE IF EXISTS temp.bootstrap_users")
+        conn.execute(
+            """CREATE TEMP TABLE bootstrap_users AS
+               SELECT id, name FROM users u
+               WHERE NOT EXISTS (SELECT 1 FROM profiles p WHERE p.user_id = u.id)"""
+        )
         try:
-            conn.execute("ALTER TABLE pitches ADD COLUMN source TEXT DEFAULT 'manual'")
+            conn.execute(
+                "UPDATE users SET account_type = 'personal' WHERE id IN (SELECT id FROM bootstrap_users)"
+            )
+            conn.execute(
+                """INSERT INTO profiles (id, user_id, name, created_at)
+                   SELECT lower(hex(randomblob(16))), b.id, b.name, ? FROM bootstrap_users b
+                   WHERE NOT EXISTS (SELECT 1 FROM profiles p WHERE p.user_id = b.id)""",
+                (now,),
+            )
+            conn.execute(
+                """UPDATE pitches
+                   SET profile_id = (SELECT p.id FROM profiles p WHERE p.user_id = pitches.user_id)
+                   WHERE user_id IN (SELECT id FROM bootstrap_users)"""
+            )
             conn.commit()
-        except sqlite3.OperationalError:
-            pass
-
-        # Migrate: for users with no profile, create one and assign pitches (existing users → personal)
-        users = conn.execute("SELECT id, name FROM users").fetchall()
-        for user in users:
-            has_profile = conn.execute(
-                "SELECT 1 FROM profiles WHERE user_id = ? LIMIT 1", (user["id"],)
-            ).fetchone()
-            if not has_profile:
-                conn.execute(
-                    "UPDATE users SET account_type = 'personal' WHERE id = ?",
-                    (user["id"],),
-                )
-                profile_id = str(uuid.uuid4())
-                now = datetime.now(timezone.utc).isoformat()
-                conn.execute(
-                    "INSERT INTO profiles (id, user_id, name, created_at) VALUES (?, ?, ?, ?)",
-                    (profile_id, user["id"], user["name"], now),
-                )
-                conn.execute(
-                    "UPDATE pitches SET profile_id = ? WHERE user_id = ?",
-                    (profile_id, user["id"]),
-                )
-        conn.commit()
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.execute("DROP TABLE IF EXISTS temp.bootstrap_users")
+
+
+# Bulk-import insert, reused by executemany so the pooled connection keeps it prepared.
+SQL_INSERT_PITCH = """INSERT INTO pitches
+    (id, user_id, profile_id, pitch_type, pitch_speed, induced_vert_break, horz_break,
+     release_height, release_side, extension_ft, total_spin, tilt_string,
+     spin_axis, efficiency, active_spin, gyro, pitcher_hand,
+     stuff_plus, stuff_plus_raw, notes, source, created_at)
+    VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)"""
+
+
+# Single-pitch save in one statement: defaults profile_id to the user's first profile, and
+# inserts nothing (rowcount 0) when an explicit profile_id belongs to someone else.
+SQL_INSERT_PITCH_FOR_OWNER = """INSERT INTO pitches
+    (id, user_id, profile_id, pitch_type, pitch_speed, induced_vert_break, horz_break,
+     release_height, release_side, extension_ft, total_spin, tilt_string,
+     spin_axis, efficiency, active_spin, gyro, pitcher_hand,
+     stuff_plus, stuff_plus_raw, notes, source, created_at)
+    SELECT :id, :user_id,
+           COALESCE(:profile_id, (SELECT id FROM profiles WHERE user_id = :user_id
+                                  ORDER BY created_at ASC LIMIT 1)),
+           :pitch_type, :pitch_speed, :induced_vert_break, :horz_break,
+           :release_height, :release_side, :extension_ft, :total_spin, :tilt_string,
+           :spin_axis, :efficiency, :active_spin, :gyro, :pitcher_hand,
+           :stuff_plus, :stuff_plus_raw, :notes, :source, :created_at
+    WHERE :profile_id IS NULL
+       OR EXISTS (SELECT 1 FROM profiles WHERE id = :profile_id AND user_id = :user_id)"""
+
+
+# One long-lived connection per thread (event loop + threadpool workers) instead of a connect per request.
+_db_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    # IMMEDIATE: implicit write transactions take the write lock up front, so concurrent
+    # writers wait on the busy timeout rather than failing to upgrade a read lock under WAL.
+    conn = sqlite3.connect(DB_PATH, isolation_level="IMMEDIATE")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_KB}")
+    return conn
 
 
 @contextmanager
 def get_db():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """Yield this thread's pooled connection. Anything left uncommitted is rolled back on exit."""
+    conn = getattr(_db_local, "conn", None)
+    if conn is None:
+        conn = _db_local.conn = _connect()
     try:
         yield conn
     finally:
-        conn.close()
+        if conn.in_transaction:
+            conn.rollback()
 
 
 # ---------------------------------------------------------------------------
@@ -269,15 +381,24 @@ def create_token(user_id: str, email: str) -> str:
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
+@lru_cache(maxsize=4096)
+def _decode_token(token: str) -> dict:
+    """Signature-checked JWT payload, memoized per exact token string. Failures are not cached."""
+    return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+
+
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     try:
-        payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return payload
+        payload = _decode_token(credentials.credentials)
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
+    # A cached payload skips jwt.decode's expiry check, so repeat it here.
+    exp = payload.get("exp")
+    if exp is not None and exp <= time.time():
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return payload
 
 
 def require_subscription(payload: dict = Depends(verify_token)):
@@ -324,75 +445,99 @@ MODEL_PATH = os.environ.get(
     "STUFF_PLUS_MODEL_PATH",
     os.path.join(os.path.dirname(__file__), "stuff_plus_model2020_2025_2.pkl"),
 )
+# Protocol-5 copy of MODEL_PATH written at build time by convert_model.py; much cheaper to load than dill.
+MODEL_PICKLE5_PATH = os.path.splitext(MODEL_PATH)[0] + ".pkl5"
+# Optional ONNX export of the model (convert_model.py --onnx); served through onnxruntime when present.
+ONNX_MODEL_PATH = os.path.splitext(MODEL_PATH)[0] + ".onnx"
+# Compile the booster to native code with treelite/tl2cgen at startup (optional deps + a C compiler).
+COMPILE_MODEL = os.environ.get("COMPILE_MODEL", "0").lower() in ("1", "true", "yes")
 
 model_college = None
 
 
+def _load_model_file():
+    """Load the pickled model, preferring an up-to-date .pkl5 over the dill original. Returns (model, path)."""
+    if (
+        os.path.exists(MODEL_PICKLE5_PATH)
+        and os.path.getmtime(MODEL_PICKLE5_PATH) >= os.path.getmtime(MODEL_PATH)
+    ):
+        with open(MODEL_PICKLE5_PATH, "rb") as f:
+            return pickle.load(f), MODEL_PICKLE5_PATH
+    dill._dill._reverse_typemap[
+        "modeling.aStuffPlusModel.aStuffPlusModel"
+    ] = "modeling.aStuffPlusModel2.aStuffPlusModel"
+    with open(MODEL_PATH, "rb") as f:
+        return aStuffPlusModel.from_pickled(dill.load(f)), MODEL_PATH
+
+
 def load_stuff_plus_model():
     global model_college
     if not os.path.exists(MODEL_PATH):
         print(f"WARNING: Model file not found at {MODEL_PATH}")
         return
-    dill._dill._reverse_typemap[
-        "modeling.aStuffPlusModel.aStuffPlusModel"
-    ] = "modeling.aStuffPlusModel2.aStuffPlusModel"
     # Pickle embeds sklearn version from training; loading with a newer sklearn warns.
     # Proper fix: re-export the model with the same sklearn you run in prod, or pin scikit-learn to that version.
     try:
         from sklearn.exceptions import InconsistentVersionWarning
     except ImportError:
         InconsistentVersionWarning = None  # type: ignore
-    with open(MODEL_PATH, "rb") as f:
-        if InconsistentVersionWarning is not None:
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore", InconsistentVersionWarning)
-                model_college = dill.load(f)
-        else:
-            model_college = dill.load(f)
-    model_college.predict_single_pitch = aStuffPlusModel.predict_single_pitch.__get__(
-        model_college
-    )
-    print(f"Stuff+ model loaded from {MODEL_PATH}")
+    if InconsistentVersionWarning is not None:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", InconsistentVersionWarning)
+            model_college, loaded_from = _load_model_file()
+    else:
+        model_college, loaded_from = _load_model_file()
+    _predict_exact.cache_clear()
+    print(f"Stuff+ model loaded from {loaded_from}")
+    if os.path.exists(ONNX_MODEL_PATH) and not model_college.load_onnx(ONNX_MODEL_PATH):
+        print(f"WARNING: {ONNX_MODEL_PATH} not loaded (onnxruntime missing or file is stale); using XGBoost")
+    if COMPILE_MODEL and not model_college.compile_predictor(MODEL_PATH):
+        print("WARNING: COMPILE_MODEL is set but treelite/tl2cgen is unavailable; using XGBoost")
+
+
+# Velocity penalty lookup: pitch type -> group index into PITCH_AVG_MLB (MLB average velo).
+# Group 0 is fastballs, which are also capped at 105 below 90 mph. Unlisted types take no penalty.
+FASTBALL_IDX = 0
+PITCH_TYPE_TO_IDX = {
+    "FF": 0, "SI": 0,
+    "CU": 1, "KC": 1, "ST": 1,
+    "SL": 2, "FC": 2,
+    "CH": 3, "SP": 3, "FS": 3,
+}
+PITCH_AVG_MLB = np.array([93.0, 75.0, 82.0, 78.0, -np.inf])
+NO_PENALTY_IDX = len(PITCH_AVG_MLB) - 1
 
 
 def velocity_penalty(pitch_type: str, avg_velo: float, pfx_z_inches: float, stuff_val: float) -> tuple:
-    penalty = 0
-    capped_stuff = stuff_val
-    if pfx_z_inches > 17:
-        pitch_type = "FF"
-    fastball_types = ["FF", "SI"]
-    if pitch_type in fastball_types:
-        avg_mlb = 93
-        if avg_velo < avg_mlb:
-            penalty = avg_mlb - avg_velo
-        if avg_velo < 90:
-            capped_stuff = min(capped_stuff, 105)
-    elif pitch_type in ("CU", "KC", "ST"):
-        avg_mlb = 75
-        if avg_velo < avg_mlb:
-            penalty = (avg_mlb - avg_velo) * 1.0
-    elif pitch_type in ("SL", "FC"):
-        avg_mlb = 82
-        if avg_velo < avg_mlb:
-            penalty = (avg_mlb - avg_velo) * 1.0
-    elif pitch_type in ("CH", "SP", "FS"):
-        avg_mlb = 78
-        if avg_velo < avg_mlb:
-            penalty = (avg_mlb - avg_velo) * 1.0
-    penalty = min(30, penalty)
+    # Anything with > 17" IVB is graded as a four-seam.
+    idx = FASTBALL_IDX if pfx_z_inches > 17 else PITCH_TYPE_TO_IDX.get(pitch_type, NO_PENALTY_IDX)
+    penalty = min(30.0, max(0.0, PITCH_AVG_MLB.item(idx) - avg_velo))
+    capped_stuff = min(stuff_val, 105) if idx == FASTBALL_IDX and avg_velo < 90 else stuff_val
     return capped_stuff - penalty, penalty
 
 
+def velocity_penalty_batch(pitch_type: str, avg_velo: np.ndarray, pfx_z_inches: np.ndarray, stuff_vals: np.ndarray) -> np.ndarray:
+    """Vectorized velocity_penalty over N variants of one pitch; returns adjusted Stuff+."""
+    idx = np.where(pfx_z_inches > 17, FASTBALL_IDX, PITCH_TYPE_TO_IDX.get(pitch_type, NO_PENALTY_IDX))
+    penalty = np.minimum(30.0, np.maximum(0.0, np.take(PITCH_AVG_MLB, idx) - avg_velo))
+    capped = np.where((idx == FASTBALL_IDX) & (avg_velo < 90), np.minimum(stuff_vals, 105), stuff_vals)
+    return capped - penalty
+
+
 # ---------------------------------------------------------------------------
 # Pydantic models
 # ---------------------------------------------------------------------------
 
+PitchType = Literal["FF", "SI", "FC", "SL", "CU", "CH", "ST", "FS", "KC"]
+PitcherHand = Literal["R", "L"]
+AccountType = Literal["personal", "team"]
+
 # Auth
 class SignupRequest(BaseModel):
     email: str
     name: str
     password: str
-    account_type: str = "personal"  # "personal" | "team"
+    account_type: AccountType = "personal"
     # RevenueCat app user ID (anonymous ID before login). Required when SIGNUP_REQUIRES_PAYMENT=1.
     revenuecat_app_user_id: Optional[str] = None
 
@@ -432,7 +577,7 @@ class MergeProfilesRequest(BaseModel):
 
 # Pitch prediction
 class PitchRequest(BaseModel):
-    pitch_type: str = Field(..., description="Pitch type code")
+    pitch_type: PitchType = Field(..., description="Pitch type code")
     release_speed: float
     pfx_x: float
     pfx_z: float
@@ -441,7 +586,7 @@ class PitchRequest(BaseModel):
     spin_axis: float
     release_pos_x: float
     release_pos_z: float
-    p_throws: str
+    p_throws: PitcherHand
     fb_velo: float
     fb_ivb: float
     fb_hmov: float
@@ -518,6 +663,11 @@ class SavedPitchResponse(BaseModel):
     source: Optional[str] = "manual"
 
 
+# Column order of SavedPitchResponse, for list queries that read rows positionally.
+SAVED_PITCH_COLUMNS = tuple(SavedPitchResponse.model_fields)
+SQL_SELECT_SAVED_PITCHES = f"SELECT {', '.join(SAVED_PITCH_COLUMNS)} FROM pitches"
+
+
 class CSVPitcherSummary(BaseModel):
     """Per-pitcher summary returned from CSV import."""
     pitcher_name: str
@@ -540,6 +690,7 @@ class CSVImportResponse(BaseModel):
 
 @app.on_event("startup")
 async def startup_event():
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
     db_dir = os.path.dirname(DB_PATH)
     if db_dir and not os.path.exists(db_dir):
         os.makedirs(db_dir, exist_ok=True)
@@ -709,14 +860,12 @@ async def webhook_revenuecat(request: Request):
 
 @app.post("/auth/signup", response_model=AuthResponse)
 @limiter.limit("5/hour")
-async def signup(request: Request, req: SignupRequest):
+def signup(request: Request, req: SignupRequest):
     if len(req.password) < 6:
         raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
     if not req.email or "@" not in req.email:
         raise HTTPException(status_code=400, detail="Invalid email address")
-    account_type = (req.account_type or "personal").lower()
-    if account_type not in ("personal", "team"):
-        account_type = "personal"
+    account_type = req.account_type
 
     rc_id = (req.revenuecat_app_user_id or "").strip()
     subscription_expires_at: Optional[str] = None
@@ -745,14 +894,14 @@ async def signup(request: Request, req: SignupRequest):
         is_subscribed_response = True
         store_rc_id = True
     else:
-        user_id = str(uuid.uuid4())
+        user_id = _new_id()
         store_rc_id = False
         if grandfathered:
             subscription_status = "active"
             is_subscribed_response = True
 
     hashed = hash_password(req.password)
-    now = datetime.now(timezone.utc).isoformat()
+    now = _now_iso()
     default_profile_id = None
 
     sub_plan: Optional[str] = account_type if (SIGNUP_REQUIRES_PAYMENT and not grandfathered) or grandfathered else None
@@ -791,7 +940,7 @@ async def signup(request: Request, req: SignupRequest):
             ),
         )
         if account_type == "personal":
-            profile_id = str(uuid.uuid4())
+            profile_id = _new_id()
             conn.execute(
                 "INSERT INTO profiles (id, user_id, name, created_at) VALUES (?, ?, ?, ?)",
                 (profile_id, user_id, req.name.strip(), now),
@@ -814,35 +963,30 @@ async def signup(request: Request, req: SignupRequest):
 
 @app.post("/auth/login", response_model=AuthResponse)
 @limiter.limit("10/minute")
-async def login(request: Request, req: LoginRequest):
+def login(request: Request, req: LoginRequest):
+    # User, subscription state and default profile in one round trip.
     with get_db() as conn:
         user = conn.execute(
-            "SELECT id, email, name, password_hash, account_type FROM users WHERE email = ?",
+            """SELECT u.id, u.email, u.name, u.password_hash, u.account_type,
+                      u.subscription_status, u.subscription_expires_at,
+                      (SELECT p.id FROM profiles p WHERE p.user_id = u.id
+                       ORDER BY p.created_at ASC LIMIT 1) AS default_profile_id
+               FROM users u WHERE u.email = ?""",
             (req.email.lower(),),
         ).fetchone()
 
-    if not user or not verify_password(req.password, user["password_hash"]):
+    # Always run bcrypt so response time doesn't reveal whether the email exists.
+    password_hash = user["password_hash"] if user else DUMMY_PASSWORD_HASH
+    password_ok = verify_password(req.password, password_hash)
+    if not user or not password_ok:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
-    with get_db() as conn:
-        sub = conn.execute(
-            "SELECT subscription_status, subscription_expires_at FROM users WHERE id = ?",
-            (user["id"],),
-        ).fetchone()
-    status = (sub["subscription_status"] or "none").lower() if sub else "none"
-    expires_at = sub["subscription_expires_at"] if sub else None
+    status = (user["subscription_status"] or "none").lower()
+    expires_at = user["subscription_expires_at"]
     is_subscribed = False
+    activate_grandfathered = False
     if _is_grandfathered(user["email"]):
-        if status != "active" or expires_at is not None:
-            with get_db() as conn:
-                conn.execute(
-                    """UPDATE users SET subscription_status = 'active',
-                       subscription_expires_at = NULL,
-                       subscription_plan = COALESCE(subscription_plan, ?)
-                       WHERE id = ?""",
-                    (user["account_type"] or "personal", user["id"]),
-                )
-                conn.commit()
+        activate_grandfathered = status != "active" or expires_at is not None
         status = "active"
         expires_at = None
         is_subscribed = True
@@ -857,25 +1001,38 @@ async def login(request: Request, req: LoginRequest):
     elif status == "active":
         is_subscribed = True
 
+    cost = _bcrypt_cost(user["password_hash"])
+    rehash = cost is not None and cost != BCRYPT_COST
     account_type = (user["account_type"] or "personal")
     default_profile_id = None
+    create_profile = False
     if account_type == "personal":
+        default_profile_id = user["default_profile_id"]
+        if not default_profile_id:
+            default_profile_id = _new_id()
+            create_profile = True
+
+    if activate_grandfathered or create_profile or rehash:
         with get_db() as conn:
-            profile = conn.execute(
-                "SELECT id FROM profiles WHERE user_id = ? ORDER BY created_at ASC LIMIT 1",
-                (user["id"],),
-            ).fetchone()
-            if profile:
-                default_profile_id = profile["id"]
-            else:
-                profile_id = str(uuid.uuid4())
-                now = datetime.now(timezone.utc).isoformat()
+            if rehash:
+                conn.execute(
+                    "UPDATE users SET password_hash = ? WHERE id = ?",
+                    (hash_password(req.password), user["id"]),
+                )
+            if activate_grandfathered:
+                conn.execute(
+                    """UPDATE users SET subscription_status = 'active',
+                       subscription_expires_at = NULL,
+                       subscription_plan = COALESCE(subscription_plan, ?)
+                       WHERE id = ?""",
+                    (account_type, user["id"]),
+                )
+            if create_profile:
                 conn.execute(
                     "INSERT INTO profiles (id, user_id, name, created_at) VALUES (?, ?, ?, ?)",
-                    (profile_id, user["id"], user["name"], now),
+                    (default_profile_id, user["id"], user["name"], _now_iso()),
                 )
-                conn.commit()
-                default_profile_id = profile_id
+            conn.commit()
 
     token = create_token(user["id"], user["email"])
     return AuthResponse(
@@ -886,26 +1043,21 @@ async def login(request: Request, req: LoginRequest):
 
 
 @app.get("/auth/me")
-async def get_me(payload: dict = Depends(verify_token)):
+def get_me(payload: dict = Depends(verify_token)):
     with get_db() as conn:
         user = conn.execute(
-            """SELECT id, email, name, account_type, created_at,
-                      subscription_status, subscription_plan, subscription_expires_at,
-                      subscription_product_id FROM users WHERE id = ?""",
+            """SELECT u.id, u.email, u.name, u.account_type, u.created_at,
+                      u.subscription_status, u.subscription_plan, u.subscription_expires_at,
+                      u.subscription_product_id,
+                      (SELECT p.id FROM profiles p WHERE p.user_id = u.id
+                       ORDER BY p.created_at ASC LIMIT 1) AS default_profile_id
+               FROM users u WHERE u.id = ?""",
             (payload["sub"],),
         ).fetchone()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     account_type = user["account_type"] or "personal"
-    default_profile_id = None
-    if account_type == "personal":
-        with get_db() as conn:
-            profile = conn.execute(
-                "SELECT id FROM profiles WHERE user_id = ? ORDER BY created_at ASC LIMIT 1",
-                (user["id"],),
-            ).fetchone()
-            if profile:
-                default_profile_id = profile["id"]
+    default_profile_id = user["default_profile_id"] if account_type == "personal" else None
     status = (user["subscription_status"] or "none").lower()
     expires_at = user["subscription_expires_at"]
     plan = user["subscription_plan"]
@@ -942,7 +1094,7 @@ async def get_me(payload: dict = Depends(verify_token)):
 
 
 @app.delete("/auth/account", status_code=204)
-async def delete_account(payload: dict = Depends(verify_token)):
+def delete_account(payload: dict = Depends(verify_token)):
     """Permanently delete the user's account and all associated data (profiles, pitches)."""
     user_id = payload["sub"]
     with get_db() as conn:
@@ -958,7 +1110,7 @@ async def delete_account(payload: dict = Depends(verify_token)):
 # ---------------------------------------------------------------------------
 
 @app.get("/profiles", response_model=list[ProfileResponse])
-async def get_profiles(payload: dict = Depends(require_subscription)):
+def get_profiles(payload: dict = Depends(require_subscription)):
     user_id = payload["sub"]
     with get_db() as conn:
         rows = conn.execute(
@@ -983,13 +1135,13 @@ async def get_profiles(payload: dict = Depends(require_subscription)):
 
 
 @app.post("/profiles", response_model=ProfileResponse, status_code=201)
-async def create_profile(
+def create_profile(
     req: CreateProfileRequest,
     payload: dict = Depends(require_subscription),
 ):
     with get_db() as conn:
-        profile_id = str(uuid.uuid4())
-        now = datetime.now(timezone.utc).isoformat()
+        profile_id = _new_id()
+        now = _now_iso()
         conn.execute(
             "INSERT INTO profiles (id, user_id, name, created_at) VALUES (?, ?, ?, ?)",
             (profile_id, payload["sub"], (req.name or "New Profile").strip(), now),
@@ -999,7 +1151,7 @@ async def create_profile(
 
 
 @app.put("/profiles/{profile_id}", response_model=ProfileResponse)
-async def rename_profile(profile_id: str, req: RenameProfileRequest, payload: dict = Depends(require_subscription)):
+def rename_profile(profile_id: str, req: RenameProfileRequest, payload: dict = Depends(require_subscription)):
     """Rename a profile."""
     user_id = payload["sub"]
     new_name = (req.name or "").strip()
@@ -1027,7 +1179,7 @@ async def rename_profile(profile_id: str, req: RenameProfileRequest, payload: di
 
 
 @app.post("/profiles/merge")
-async def merge_profiles(req: MergeProfilesRequest, payload: dict = Depends(require_subscription)):
+def merge_profiles(req: MergeProfilesRequest, payload: dict = Depends(require_subscription)):
     """Merge source profile into target. Moves all pitches, then deletes source profile. Team accounts only."""
     user_id = payload["sub"]
     with get_db() as conn:
@@ -1056,7 +1208,7 @@ async def merge_profiles(req: MergeProfilesRequest, payload: dict = Depends(requ
 
 
 @app.delete("/profiles/{profile_id}", status_code=200)
-async def delete_profile(profile_id: str, payload: dict = Depends(require_subscription)):
+def delete_profile(profile_id: str, payload: dict = Depends(require_subscription)):
     """Delete a profile and all its pitches. Team accounts only."""
     user_id = payload["sub"]
     with get_db() as conn:
@@ -1089,13 +1241,8 @@ async def delete_profile(profile_id: str, payload: dict = Depends(require_subscr
 async def predict_stuff_plus(request: Request, pitch_request: PitchRequest, payload: dict = Depends(require_subscription)):
     if model_college is None:
         raise HTTPException(status_code=503, detail="Stuff+ model not loaded")
-    valid_types = {"FF", "SI", "FC", "SL", "CU", "CH", "ST", "FS", "KC"}
-    if pitch_request.pitch_type not in valid_types:
-        raise HTTPException(status_code=400, detail=f"Invalid pitch type '{pitch_request.pitch_type}'")
-    if pitch_request.p_throws not in ("R", "L"):
-        raise HTTPException(status_code=400, detail="p_throws must be 'R' or 'L'")
     try:
-        raw_stuff = model_college.predict_single_pitch(
+        raw_stuff = _predict_cached(
             pitch_type=pitch_request.pitch_type,
             release_speed=pitch_request.release_speed,
             pfx_x=pitch_request.pfx_x,
@@ -1114,7 +1261,7 @@ async def predict_stuff_plus(request: Request, pitch_request: PitchRequest, payl
         adjusted_stuff, penalty = velocity_penalty(
             pitch_request.pitch_type, pitch_request.release_speed, pfx_z_inches, raw_stuff
         )
-        final_stuff = float(np.clip(adjusted_stuff, 60, 140))
+        final_stuff = min(140.0, max(60.0, adjusted_stuff))
         return PitchResponse(
             stuff_plus=round(final_stuff, 1),
             stuff_plus_raw=round(final_stuff, 1),
@@ -1124,6 +1271,42 @@ async def predict_stuff_plus(request: Request, pitch_request: PitchRequest, payl
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 
+def _predict_single(pitch_type: str, p_throws: str, values: tuple) -> float:
+    """Raw Stuff+ for one pitch through the model's single-row path; values follow _predict_batch's columns."""
+    return model_college.predict_single_pitch(pitch_type, *values[:8], p_throws, *values[8:])
+
+
+@lru_cache(maxsize=4096)
+def _predict_exact(pitch_type: str, p_throws: str, values: tuple) -> float:
+    """Raw model output for one exact input tuple. The model is deterministic, so slider repeats are free."""
+    return _predict_single(pitch_type, p_throws, values)
+
+
+def _predict_cached(
+    pitch_type: str,
+    release_speed: float,
+    pfx_x: float,
+    pfx_z: float,
+    release_extension: float,
+    release_spin_rate: float,
+    spin_axis: float,
+    release_pos_x: float,
+    release_pos_z: float,
+    p_throws: str,
+    fb_velo: float,
+    fb_ivb: float,
+    fb_hmov: float,
+) -> float:
+    """Raw Stuff+ for one pitch through the LRU cache; NaN/inf inputs bypass it."""
+    values = (
+        release_speed, pfx_x, pfx_z, release_extension, release_spin_rate, spin_axis,
+        release_pos_x, release_pos_z, fb_velo, fb_ivb, fb_hmov,
+    )
+    if not all(map(math.isfinite, values)):
+        return _predict_single(pitch_type, p_throws, values)
+    return _predict_exact(pitch_type, p_throws, tuple(map(float, values)))
+
+
 def _run_prediction(
     pitch_type: str,
     release_speed: float,
@@ -1142,7 +1325,7 @@ def _run_prediction(
     """Run a single Stuff+ prediction; returns final stuff_plus value."""
     if model_college is None:
         return 0.0
-    raw_stuff = model_college.predict_single_pitch(
+    raw_stuff = _predict_cached(
         pitch_type=pitch_type,
         release_speed=release_speed,
         pfx_x=pfx_x,
@@ -1161,7 +1344,47 @@ def _run_prediction(
     adjusted_stuff, _ = velocity_penalty(
         pitch_type, release_speed, pfx_z_inches, raw_stuff
     )
-    return float(np.clip(adjusted_stuff, 60, 140))
+    return min(140.0, max(60.0, adjusted_stuff))
+
+
+def _predict_batch(pitch_type: str, p_throws: str, X: np.ndarray) -> np.ndarray:
+    """Raw Stuff+ for N variants of one pitch in a single model call.
+
+    X has one row per variant with columns: release_speed, pfx_x, pfx_z, release_extension,
+    release_spin_rate, spin_axis, release_pos_x, release_pos_z, fb_velo, fb_ivb, fb_hmov.
+    Uses the model's vectorized feature engineering without the per-row Python wrapper.
+    """
+    return model_college.predict_features(model_college.feature_matrix(X, p_throws == "L"), pitch_type)
+
+
+def _run_prediction_batch(pitch_type: str, p_throws: str, X: np.ndarray) -> np.ndarray:
+    """Batched _run_prediction: final Stuff+ (velocity penalty applied, clipped) for each row of X."""
+    raw_stuff = _predict_batch(pitch_type, p_throws, X)
+    adjusted = velocity_penalty_batch(pitch_type, X[:, 0], X[:, 2] * 12, raw_stuff)
+    return np.clip(adjusted, 60, 140)
+
+
+def _run_prediction_many(pitch_rows: list[dict]) -> list[Optional[float]]:
+    """_run_prediction for a list of its keyword dicts, scored in one model call.
+
+    If the batch fails, each row is retried on its own and a row that still fails gets None.
+    """
+    if not pitch_rows:
+        return []
+    try:
+        raw_stuff = model_college.predict_many(pitch_rows).tolist()
+    except Exception:
+        results = []
+        for row in pitch_rows:
+            try:
+                results.append(_run_prediction(**row))
+            except Exception:
+                results.append(None)
+        return results
+    return [
+        min(140.0, max(60.0, velocity_penalty(row["pitch_type"], row["release_speed"], row["pfx_z"] * 12, raw)[0]))
+        for row, raw in zip(pitch_rows, raw_stuff)
+    ]
 
 
 @app.post("/predict/suggest", response_model=SuggestResponse)
@@ -1170,32 +1393,10 @@ async def suggest_improvement(request: Request, pitch_request: PitchRequest, pay
     """Run variations (+1 mph, ±1" IVB, ±1" HB, ±1 mph, ±100 rpm) and suggest what would most improve Stuff+."""
     if model_college is None:
         raise HTTPException(status_code=503, detail="Stuff+ model not loaded")
-    valid_types = {"FF", "SI", "FC", "SL", "CU", "CH", "ST", "FS", "KC"}
-    if pitch_request.pitch_type not in valid_types:
-        raise HTTPException(status_code=400, detail=f"Invalid pitch type '{pitch_request.pitch_type}'")
-    if pitch_request.p_throws not in ("R", "L"):
-        raise HTTPException(status_code=400, detail="p_throws must be 'R' or 'L'")
 
     base = pitch_request
     inch_to_ft = 1.0 / 12.0
 
-    def run(mod_speed=0, mod_pfx_x=0, mod_pfx_z=0, mod_spin=0):
-        return _run_prediction(
-            base.pitch_type,
-            base.release_speed + mod_speed,
-            base.pfx_x + mod_pfx_x,
-            base.pfx_z + mod_pfx_z,
-            base.release_extension,
-            base.release_spin_rate + mod_spin,
-            base.spin_axis,
-            base.release_pos_x,
-            base.release_pos_z,
-            base.p_throws,
-            base.fb_velo,
-            base.fb_ivb,
-            base.fb_hmov,
-        )
-
     variations = [
         (+1, 0, 0, 0, "adding 1 mph"),
         (0, 0, inch_to_ft, 0, "adding 1\" IVB"),
@@ -1207,16 +1408,29 @@ async def suggest_improvement(request: Request, pitch_request: PitchRequest, pay
         (0, 0, 0, -100, "subtracting 100 rpm spin"),
     ]
 
-    baseline = run()
+    # Row 0 is the baseline; rows 1..8 apply each variation. Scored in one model call.
+    X = np.tile(
+        [
+            base.release_speed, base.pfx_x, base.pfx_z, base.release_extension,
+            base.release_spin_rate, base.spin_axis, base.release_pos_x, base.release_pos_z,
+            base.fb_velo, base.fb_ivb, base.fb_hmov,
+        ],
+        (len(variations) + 1, 1),
+    )
+    deltas = np.array([v[:4] for v in variations], dtype=float)
+    X[1:, 0] += deltas[:, 0]
+    X[1:, 1] += deltas[:, 1]
+    X[1:, 2] += deltas[:, 2]
+    X[1:, 4] += deltas[:, 3]
+
+    scores = _run_prediction_batch(base.pitch_type, base.p_throws, X)
+    improvements = scores[1:] - scores[0]
+    best = int(np.argmax(improvements))
     best_improvement = 0.0
     best_suggestion = None
-
-    for mod_speed, mod_pfx_x, mod_pfx_z, mod_spin, label in variations:
-        score = run(mod_speed, mod_pfx_x, mod_pfx_z, mod_spin)
-        improvement = score - baseline
-        if improvement > best_improvement:
-            best_improvement = improvement
-            best_suggestion = label
+    if improvements[best] > 0:
+        best_improvement = float(improvements[best])
+        best_suggestion = variations[best][4]
 
     if best_suggestion and best_improvement > 0:
         suggestion = f"To improve Stuff+: try {best_suggestion} (+{best_improvement:.1f})"
@@ -1235,6 +1449,27 @@ async def suggest_improvement(request: Request, pitch_request: PitchRequest, pay
 INCH_TO_FT = 1.0 / 12.0
 
 
+def _import_pitch_row(p: dict, hand: str, fb_velo: float, fb_ivb: float, fb_hmov: float) -> dict:
+    """_run_prediction keyword dict for a parsed Trackman pitch, with defaults for missing fields."""
+    ivb = p.get("induced_vert_break") or 0
+    hb = p.get("horz_break") or 0
+    return dict(
+        pitch_type=p["pitch_type"],
+        release_speed=p.get("pitch_speed") or 0,
+        pfx_x=-hb * INCH_TO_FT,
+        pfx_z=ivb * INCH_TO_FT,
+        release_extension=p.get("extension_ft") or 6.0,
+        release_spin_rate=p.get("total_spin") or 2000.0,
+        spin_axis=p.get("spin_axis") or _spin_axis_from_movement(ivb, hb),
+        release_pos_x=-(p.get("release_side") or 0.0),
+        release_pos_z=p.get("release_height") or 5.0,
+        p_throws=hand,
+        fb_velo=fb_velo,
+        fb_ivb=fb_ivb,
+        fb_hmov=fb_hmov,
+    )
+
+
 @app.post("/parse-trackman-pdf", response_model=list[ParsedTrackmanPitch])
 @limiter.limit("20/hour")
 async def parse_trackman_pdf_endpoint(
@@ -1275,31 +1510,16 @@ async def parse_trackman_pdf_endpoint(
     else:
         fb_velo = fb_ivb = fb_hmov = None
 
+    # Score every pitch in one model call.
+    scores = [None] * len(pitches)
+    if model_college and fb_velo is not None:
+        scores = _run_prediction_many([_import_pitch_row(p, hand, fb_velo, fb_ivb, fb_hmov) for p in pitches])
+
     result = []
-    for p in pitches:
-        pt = p["pitch_type"]
-        velo = p.get("pitch_speed") or 0
-        ivb = p.get("induced_vert_break") or 0
-        hb = p.get("horz_break") or 0
-        stuff_plus = stuff_plus_raw = None
-        if model_college and fb_velo is not None:
-            pfx_z = ivb * INCH_TO_FT
-            pfx_x = -hb * INCH_TO_FT
-            spin_axis = p.get("spin_axis") or _spin_axis_from_movement(ivb, hb)
-            ext = p.get("extension_ft") or 6.0
-            spin = p.get("total_spin") or 2000.0
-            relh = p.get("release_height") or 5.0
-            rels = p.get("release_side") or 0.0
-            try:
-                stuff_plus_raw = _run_prediction(
-                    pt, velo, pfx_x, pfx_z, ext, spin, spin_axis,
-                    -rels, relh, hand, fb_velo, fb_ivb, fb_hmov,
-                )
-                stuff_plus = round(stuff_plus_raw, 1)
-            except Exception:
-                pass
+    for p, stuff_plus_raw in zip(pitches, scores):
+        stuff_plus = round(stuff_plus_raw, 1) if stuff_plus_raw is not None else None
         result.append(ParsedTrackmanPitch(
-            pitch_type=pt,
+            pitch_type=p["pitch_type"],
             pitch_speed=p.get("pitch_speed"),
             induced_vert_break=p.get("induced_vert_break"),
             horz_break=p.get("horz_break"),
@@ -1391,7 +1611,7 @@ def _parse_csv_rows(content: str) -> list[dict]:
     return pitches
 
 
-VALID_PITCH_CODES = {"FF", "SI", "FC", "SL", "CU", "CH", "ST", "FS", "KC"}
+VALID_PITCH_CODES = frozenset(get_args(PitchType))
 
 
 def _parse_hawkeye_csv_rows(content: str) -> list[dict]:
@@ -1448,7 +1668,7 @@ def _bulk_import_pitches(
     for p in pitches:
         pitchers.setdefault(p["pitcher_name"], []).append(p)
 
-    now = datetime.now(timezone.utc).isoformat()
+    now = _now_iso()
     summaries: list[CSVPitcherSummary] = []
     total_saved = 0
 
@@ -1459,7 +1679,7 @@ def _bulk_import_pitches(
         if pitcher_key in profile_map:
             profile_id = profile_map[pitcher_key]
         else:
-            profile_id = str(uuid.uuid4())
+            profile_id = _new_id()
             with get_db() as conn:
                 conn.execute(
                     "INSERT INTO profiles (id, user_id, name, created_at) VALUES (?, ?, ?, ?)",
@@ -1483,51 +1703,33 @@ def _bulk_import_pitches(
         else:
             fb_velo = fb_ivb = fb_hmov = None
 
+        # Score this pitcher's pitches in one model call; pitches without a velocity are not graded.
+        scores = [None] * len(pitcher_pitches)
+        if model_college and fb_velo is not None:
+            graded = [i for i, p in enumerate(pitcher_pitches) if (p.get("pitch_speed") or 0) > 0]
+            for i, stuff_plus_raw in zip(graded, _run_prediction_many(
+                [_import_pitch_row(pitcher_pitches[i], hand, fb_velo, fb_ivb, fb_hmov) for i in graded]
+            )):
+                scores[i] = stuff_plus_raw
+
         saved_ids: list[str] = []
+        rows: list[tuple] = []
+        for p, stuff_plus_raw in zip(pitcher_pitches, scores):
+            stuff_plus = round(stuff_plus_raw, 1) if stuff_plus_raw is not None else None
+            pitch_id = _new_id()
+            rows.append((
+                pitch_id, user_id, profile_id, p["pitch_type"], p.get("pitch_speed"),
+                p.get("induced_vert_break"), p.get("horz_break"),
+                p.get("release_height"), p.get("release_side"),
+                p.get("extension_ft"), p.get("total_spin"),
+                p.get("tilt_string"), p.get("spin_axis"),
+                p.get("efficiency"), None, None, hand,
+                stuff_plus, stuff_plus_raw, None, source, now,
+            ))
+            saved_ids.append(pitch_id)
+
         with get_db() as conn:
-            for p in pitcher_pitches:
-                pt = p["pitch_type"]
-                velo = p.get("pitch_speed") or 0
-                ivb = p.get("induced_vert_break") or 0
-                hb = p.get("horz_break") or 0
-                stuff_plus = stuff_plus_raw = None
-
-                if model_college and fb_velo is not None and velo > 0:
-                    pfx_z = ivb * INCH_TO_FT
-                    pfx_x = -hb * INCH_TO_FT
-                    spin_axis = p.get("spin_axis") or _spin_axis_from_movement(ivb, hb)
-                    ext = p.get("extension_ft") or 6.0
-                    spin = p.get("total_spin") or 2000.0
-                    relh = p.get("release_height") or 5.0
-                    rels = p.get("release_side") or 0.0
-                    try:
-                        stuff_plus_raw = _run_prediction(
-                            pt, velo, pfx_x, pfx_z, ext, spin, spin_axis,
-                            -rels, relh, hand, fb_velo, fb_ivb, fb_hmov,
-                        )
-                        stuff_plus = round(stuff_plus_raw, 1)
-                    except Exception:
-                        pass
-
-                pitch_id = str(uuid.uuid4())
-                conn.execute(
-                    """INSERT INTO pitches
-                       (id, user_id, profile_id, pitch_type, pitch_speed, induced_vert_break, horz_break,
-                        release_height, release_side, extension_ft, total_spin, tilt_string,
-                        spin_axis, efficiency, active_spin, gyro, pitcher_hand,
-                        stuff_plus, stuff_plus_raw, notes, source, created_at)
-                       VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
-                    (
-                        pitch_id, user_id, profile_id, pt, p.get("pitch_speed"),
-                        p.get("induced_vert_break"), p.get("horz_break"),
-                        p.get("release_height"), p.get("release_side"),
-                        p.get("extension_ft"), p.get("total_spin"),
-                        p.get("tilt_string"), p.get("spin_axis"),
-                        p.get("efficiency"), None, None, hand,
-                        stuff_plus, stuff_plus_raw, None, source, now,
-                    ),
-                )
-                saved_ids.append(pitch_id)
+            conn.executemany(SQL_INSERT_PITCH, rows)
             conn.commit()
 
         total_saved += len(saved_ids)
@@ -1613,42 +1815,17 @@ async def parse_hawkeye_csv_endpoint(
 # ---------------------------------------------------------------------------
 
 @app.post("/pitches", response_model=SavedPitchResponse, status_code=201)
-async def save_pitch(req: SavePitchRequest, payload: dict = Depends(require_subscription)):
-    pitch_id = str(uuid.uuid4())
-    now = datetime.now(timezone.utc).isoformat()
+def save_pitch(req: SavePitchRequest, payload: dict = Depends(require_subscription)):
+    pitch_id = _new_id()
+    now = _now_iso()
     user_id = payload["sub"]
 
+    params = req.model_dump()
+    params.update(id=pitch_id, user_id=user_id, profile_id=req.profile_id or None, created_at=now)
     with get_db() as conn:
-        profile_id = req.profile_id
-        if not profile_id:
-            profile = conn.execute(
-                "SELECT id FROM profiles WHERE user_id = ? ORDER BY created_at ASC LIMIT 1",
-                (user_id,),
-            ).fetchone()
-            if profile:
-                profile_id = profile["id"]
-        if profile_id:
-            owner = conn.execute(
-                "SELECT user_id FROM profiles WHERE id = ?", (profile_id,)
-            ).fetchone()
-            if not owner or owner["user_id"] != user_id:
-                raise HTTPException(status_code=403, detail="Invalid profile")
-        conn.execute(
-            """INSERT INTO pitches
-               (id, user_id, profile_id, pitch_type, pitch_speed, induced_vert_break, horz_break,
-                release_height, release_side, extension_ft, total_spin, tilt_string,
-                spin_axis, efficiency, active_spin, gyro, pitcher_hand,
-                stuff_plus, stuff_plus_raw, notes, source, created_at)
-               VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
-            (
-                pitch_id, user_id, profile_id, req.pitch_type, req.pitch_speed,
-                req.induced_vert_break, req.horz_break, req.release_height,
-                req.release_side, req.extension_ft, req.total_spin,
-                req.tilt_string, req.spin_axis, req.efficiency, req.active_spin,
-                req.gyro, req.pitcher_hand, req.stuff_plus, req.stuff_plus_raw,
-                req.notes, req.source, now,
-            ),
-        )
+        inserted = conn.execute(SQL_INSERT_PITCH_FOR_OWNER, params).rowcount
+        if not inserted:
+            raise HTTPException(status_code=403, detail="Invalid profile")
         conn.commit()
 
     return SavedPitchResponse(
@@ -1665,7 +1842,7 @@ async def save_pitch(req: SavePitchRequest, payload: dict = Depends(require_subs
 
 
 @app.get("/pitches", response_model=list[SavedPitchResponse])
-async def get_pitches(
+def get_pitches(
     payload: dict = Depends(require_subscription),
     limit: int = 50,
     offset: int = 0,
@@ -1680,7 +1857,7 @@ async def get_pitches(
     """Get pitches with pagination and filtering (pitch type, date range, Stuff+ range, source)."""
     user_id = payload["sub"]
 
-    query = "SELECT * FROM pitches WHERE user_id = ?"
+    query = SQL_SELECT_SAVED_PITCHES + " WHERE user_id = ?"
     params: list = [user_id]
 
     if profile_id:
@@ -1715,26 +1892,21 @@ async def get_pitches(
             ).fetchone()
             if not owner or owner["user_id"] != user_id:
                 raise HTTPException(status_code=403, detail="Invalid profile")
-        rows = conn.execute(query, params).fetchall()
-
-    def _pitch(r):
-        return SavedPitchResponse(
-            id=r["id"], pitch_type=r["pitch_type"], pitch_speed=r["pitch_speed"],
-            induced_vert_break=r["induced_vert_break"], horz_break=r["horz_break"],
-            release_height=r["release_height"], release_side=r["release_side"],
-            extension_ft=r["extension_ft"], total_spin=r["total_spin"],
-            tilt_string=r["tilt_string"], spin_axis=r["spin_axis"],
-            efficiency=r["efficiency"], active_spin=r["active_spin"],
-            gyro=r["gyro"], pitcher_hand=r["pitcher_hand"],
-            stuff_plus=r["stuff_plus"], stuff_plus_raw=r["stuff_plus_raw"],
-            notes=r["notes"], created_at=r["created_at"],
-            source=r["source"] if "source" in r.keys() else "manual",
-        )
-    return [_pitch(r) for r in rows]
+        # Plain tuples rather than sqlite3.Row: columns are matched up by position below.
+        cur = conn.cursor()
+        cur.row_factory = None
+        rows = cur.execute(query, params).fetchall()
+
+    # Rows come straight from our own table, so skip per-row model validation and serialize with orjson.
+    # response_model above still documents the shape.
+    return Response(
+        content=orjson.dumps([dict(zip(SAVED_PITCH_COLUMNS, r)) for r in rows]),
+        media_type="application/json",
+    )
 
 
 @app.get("/pitches/export")
-async def export_pitches_csv(
+def export_pitches_csv(
     payload: dict = Depends(require_subscription),
     profile_id: Optional[str] = None,
     pitch_type: Optional[str] = None,
@@ -1817,7 +1989,7 @@ class UpdatePitchRequest(BaseModel):
 
 
 @app.put("/pitches/{pitch_id}", response_model=SavedPitchResponse)
-async def update_pitch(pitch_id: str, req: UpdatePitchRequest, payload: dict = Depends(require_subscription)):
+def update_pitch(pitch_id: str, req: UpdatePitchRequest, payload: dict = Depends(require_subscription)):
     """Update a saved pitch's data fields. When regrade=true (default), re-runs the Stuff+ model."""
     user_id = payload["sub"]
     with get_db() as conn:
@@ -1920,7 +2092,7 @@ async def update_pitch(pitch_id: str, req: UpdatePitchRequest, payload: dict = D
 
 
 @app.delete("/pitches/{pitch_id}", status_code=204)
-async def delete_pitch(pitch_id: str, payload: dict = Depends(require_subscription)):
+def delete_pitch(pitch_id: str, payload: dict = Depends(require_subscription)):
     user_id = payload["sub"]
     with get_db() as conn:
         row = conn.execute(
@@ -1938,4 +2110,11 @@ async def delete_pitch(pitch_id: str, payload: dict = Depends(require_subscripti
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", "8000")),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=int(os.environ.get("WEB_CONCURRENCY", "1")),
+    )
@@ -1,3 +1,83 @@
+import hashlib
+import os
+import threading
+from operator import itemgetter
+
+import numpy as np
+import xgboost as xgb
+
+try:  # Optional: pip install treelite tl2cgen (needs gcc)
+    import tl2cgen
+    import treelite
+except ImportError:
+    tl2cgen = None
+
+try:  # Optional: pip install onnxruntime (plus onnxmltools to export)
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+try:  # Optional: pip install numba
+    import numba
+except ImportError:
+    numba = None
+
+# Batches at least this large use the multi-threaded booster.
+THREADED_MIN_ROWS = 1024
+# Smaller frames resolve pitch types with searchsorted; larger ones with pandas' map.
+SEARCHSORTED_MAX_ROWS = 1024
+# Batches at least this large use the numba kernel.
+FUSED_MIN_ROWS = 4096
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _scale_and_clip(preds, idx, means, scales, lo, hi, out):
+        for i in numba.prange(preds.shape[0]):
+            k = idx[i]
+            v = np.float32(100.0) + ((preds[i] - means[k]) / scales[k]) * np.float32(10.0)
+            # Comparisons rather than min/max so NaN passes through like np.clip.
+            if v < lo:
+                v = lo
+            elif v > hi:
+                v = hi
+            out[i] = v
+else:
+    _scale_and_clip = None
+
+# Features are computed in float64 and rounded once into float32, as xgboost itself would.
+PITCH_INPUTS = (
+    'release_speed',
+    'pfx_x',
+    'pfx_z',
+    'release_extension',
+    'release_spin_rate',
+    'spin_axis',
+    'release_pos_x',
+    'release_pos_z',
+    'fb_velo',
+    'fb_ivb',
+    'fb_hmov'
+)
+
+_get_pitch_inputs = itemgetter(*PITCH_INPUTS)
+_get_pitch_type = itemgetter('pitch_type')
+_get_p_throws = itemgetter('p_throws')
+
+SINGLE_PITCH_FEATURES = (
+    'release_speed',
+    'pfx_z',
+    'adj_hmov',
+    'release_spin_rate',
+    'adj_spin_axis',
+    'release_extension',
+    'release_pos_z',
+    'adj_release_x',
+    'velo_diff',
+    'ivb_diff',
+    'hmov_diff'
+)
+
+
 class aStuffPlusModel:
     def __init__(self):
         self.model = None
@@ -25,11 +105,149 @@ class aStuffPlusModel:
         self.global_scaler = None
         self.min_stuff = 40
         self.max_stuff = 160
+        self._prepare()
+
+    def __getstate__(self):
+        # Underscore attributes are derived and rebuilt by _prepare.
+        return {k: v for k, v in self.__dict__.items() if not k.startswith('_')}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._prepare()
+
+    def _prepare(self):
+        self._index_scalers()
+        self._bind_booster()
+        self._clip_lo = np.float32(self.min_stuff)
+        self._clip_hi = np.float32(self.max_stuff)
+        self._feature_cols = np.array([self.numeric_features.index(f) for f in SINGLE_PITCH_FEATURES])
+        self._local = threading.local()
+        self._predict_fn = self._make_predict_fn()
+
+    def _bind_booster(self):
+        self._fast_predictor = None
+        self._ort_session = None
+        if self.model is None:
+            self._booster = None
+            return
+        self._booster = self.model.get_booster()
+        self.configure_threads()
+        try:
+            best_iteration = self.model.best_iteration
+        except AttributeError:
+            best_iteration = None
+        self._iteration_range = (0, best_iteration + 1) if best_iteration is not None else (0, 0)
+        self._missing = self.model.missing
+
+    def configure_threads(self, batch_threads=None, single_threads=1):
+        """Single-threaded booster for small calls, a separate copy with batch_threads for large batches."""
+        if batch_threads is None:
+            batch_threads = min(os.cpu_count() or 1, 4)
+        self.model.set_params(n_jobs=single_threads)
+        self._booster.set_param({'nthread': single_threads})
+        if batch_threads == single_threads:
+            self._batch_booster = self._booster
+        else:
+            self._batch_booster = self._booster.copy()
+            self._batch_booster.set_param({'nthread': batch_threads})
+
+    def _booster_digest(self) -> str:
+        return hashlib.sha256(self._booster.save_raw('ubj')).hexdigest()[:16]
+
+    def compile_predictor(self, model_path: str) -> bool:
+        """Predict through a tl2cgen shared library cached next to model_path. False if unavailable."""
+        if tl2cgen is None or self._booster is None or self._iteration_range != (0, 0):
+            return False
+        lib_path = f"{os.path.splitext(model_path)[0]}.{self._booster_digest()}.so"
+        if not os.path.exists(lib_path):
+            tmp_path = f"{lib_path}.{os.getpid()}.tmp.so"
+            tl2cgen.export_lib(
+                treelite.frontend.from_xgboost(self._booster),
+                toolchain='gcc',
+                libpath=tmp_path,
+                params={'parallel_comp': os.cpu_count() or 1},
+            )
+            os.replace(tmp_path, lib_path)
+        self._fast_predictor = tl2cgen.Predictor(lib_path)
+        print(f"Compiled predictor loaded from {lib_path}")
+        return True
+
+    def export_onnx(self, path: str):
+        from onnxmltools.convert import convert_xgboost
+        from onnxmltools.convert.common.data_types import FloatTensorType
+
+        # The converter only accepts positional feature names.
+        booster = self._booster.copy()
+        booster.feature_names = None
+        booster.feature_types = None
+        onnx_model = convert_xgboost(
+            booster, initial_types=[('input', FloatTensorType([None, len(self.numeric_features)]))]
+        )
+        onnx_model.metadata_props.add(key='booster_digest', value=self._booster_digest())
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(onnx_model.SerializeToString())
+        os.replace(tmp_path, path)
+
+    def load_onnx(self, path: str) -> bool:
+        """Predict through onnxruntime. False if it is missing or path was exported from another booster."""
+        if onnxruntime is None:
+            return False
+        session = onnxruntime.InferenceSession(path, providers=['CPUExecutionProvider'])
+        if session.get_modelmeta().custom_metadata_map.get('booster_digest') != self._booster_digest():
+            print(f"Ignoring {path}: exported from a different model; rerun convert_model.py --onnx")
+            return False
+        self._ort_session = session
+        self._ort_input = session.get_inputs()[0].name
+        print(f"ONNX Runtime session loaded from {path}")
+        return True
+
+    def predict_raw(self, features):
+        if self._fast_predictor is not None:
+            return self._fast_predictor.predict(tl2cgen.DMatrix(features)).reshape(len(features))
+        if self._ort_session is not None:
+            return self._ort_session.run(None, {self._ort_input: features})[0].reshape(len(features))
+        booster = self._batch_booster if len(features) >= THREADED_MIN_ROWS else self._booster
+        return booster.inplace_predict(
+            features,
+            iteration_range=self._iteration_range,
+            missing=self._missing,
+            validate_features=False,
+        )
+
+    def _single_buf(self):
+        buf = getattr(self._local, 'buf', None)
+        if buf is None:
+            buf = self._local.buf = np.empty((1, len(self.numeric_features)), dtype=np.float32)
+        return buf
+
+    @classmethod
+    def from_pickled(cls, obj):
+        # dill pickles embed their own copy of the class; rebuild obj's state on this one.
+        model = cls.__new__(cls)
+        model.__setstate__({k: v for k, v in vars(obj).items() if not k.startswith('_')})
+        return model
+
+    def _index_scalers(self):
+        # Per-pitch-type scaler mean/scale as float32 arrays; the global scaler takes the last slot.
+        pitch_types = sorted(self.scalers)
+        self._pt_index = {pt: i for i, pt in enumerate(pitch_types)}
+        self._pt_sorted = np.array(pitch_types, dtype=str)
+        self._global_idx = len(pitch_types)
+        stats = [self.scalers[pt] for pt in pitch_types] + [self.global_scaler]
+        self._means = np.array([s.mean_[0] if s is not None else 0.0 for s in stats], dtype=np.float32)
+        self._scales = np.array([s.scale_[0] if s is not None else 1.0 for s in stats], dtype=np.float32)
 
     def load_model(self, path: str):
-        import xgboost as xgb
         self.model = xgb.XGBRegressor()
         self.model.load_model(path)
+        self._bind_booster()
+        scalers_path = path + '.scalers.npz'
+        if os.path.exists(scalers_path):
+            self.load_scalers(scalers_path)
+        onnx_path = os.path.splitext(path)[0] + '.onnx'
+        if os.path.exists(onnx_path):
+            self.load_onnx(onnx_path)
         print(f"Model loaded from {path}")
         return self.model
 
@@ -37,28 +255,80 @@ class aStuffPlusModel:
         if self.model is None:
             raise ValueError("Model must be trained before saving")
         self.model.save_model(path)
+        if self.global_scaler is not None:
+            self.save_scalers(path + '.scalers.npz')
         print(f"Model saved to {path}")
 
-    def predict_stuff_plus(self, X):
-        import numpy as np
-        if self.model is None:
-            raise ValueError("Model must be trained before making predictions")
+    def save_scalers(self, path: str):
+        pitch_types = sorted(self.scalers)
+        np.savez(
+            path,
+            pitch_types=np.array(pitch_types, dtype=str),
+            means=np.array([self.scalers[pt].mean_[0] for pt in pitch_types]),
+            scales=np.array([self.scalers[pt].scale_[0] for pt in pitch_types]),
+            global_mean=self.global_scaler.mean_[0],
+            global_scale=self.global_scaler.scale_[0],
+        )
 
-        missing = [c for c in self.numeric_features if c not in X.columns]
-        if missing:
-            raise ValueError(f"Missing numeric features for prediction: {missing}")
+    def load_scalers(self, path: str):
+        with np.load(path) as data:
+            pitch_types = data['pitch_types'].tolist()
+            self._pt_index = {pt: i for i, pt in enumerate(pitch_types)}
+            self._pt_sorted = np.array(pitch_types, dtype=str)
+            self._global_idx = len(pitch_types)
+            self._means = np.append(data['means'], data['global_mean']).astype(np.float32)
+            self._scales = np.append(data['scales'], data['global_scale']).astype(np.float32)
+        self._predict_fn = self._make_predict_fn()
 
-        preds = self.model.predict(X[self.numeric_features])
-        stuff_vals = []
+    def _pitch_type_index(self, pitch_types):
+        codes = np.asarray(pitch_types, dtype=str)
+        if not len(self._pt_sorted):
+            return np.full(len(codes), self._global_idx, dtype=np.intp)
+        pos = np.searchsorted(self._pt_sorted, codes)
+        pos[pos == len(self._pt_sorted)] = 0
+        return np.where(self._pt_sorted[pos] == codes, pos, self._global_idx)
 
-        for pitch_type, raw_pred in zip(X['pitch_type'], preds):
-            scaler = self.scalers.get(pitch_type, self.global_scaler)
-            scaled = (raw_pred - scaler.mean_[0]) / scaler.scale_[0]
-            sp = 100.0 + (scaled * 10.0)
-            sp = float(np.clip(sp, self.min_stuff, self.max_stuff))
-            stuff_vals.append(sp)
+    def _to_stuff_plus(self, preds, idx):
+        if _scale_and_clip is not None and len(preds) >= FUSED_MIN_ROWS:
+            out = np.empty(len(preds), dtype=np.float32)
+            _scale_and_clip(
+                preds.astype(np.float32, copy=False), idx, self._means, self._scales,
+                self._clip_lo, self._clip_hi, out
+            )
+            return out
+        scaled = (preds - self._means[idx]) / self._scales[idx]
+        return np.clip(100.0 + (scaled * 10.0), self._clip_lo, self._clip_hi)
 
-        return np.array(stuff_vals)
+    def _make_predict_fn(self):
+        # predict_stuff_plus with the per-model constants bound once; rebuilt when the scalers change.
+        features = list(self.numeric_features)
+        required = frozenset(features)
+        pt_index = self._pt_index
+        global_idx = self._global_idx
+        predict_raw = self.predict_raw
+        pitch_type_index = self._pitch_type_index
+        to_stuff_plus = self._to_stuff_plus
+
+        def predict_fn(X):
+            missing = required.difference(X.columns)
+            if missing:
+                missing = [c for c in features if c in missing]
+                raise ValueError(f"Missing numeric features for prediction: {missing}")
+
+            preds = predict_raw(np.ascontiguousarray(X[features].to_numpy(dtype=np.float32)))
+            pitch_types = X['pitch_type']
+            if len(X) < SEARCHSORTED_MAX_ROWS:
+                idx = pitch_type_index(pitch_types.to_numpy())
+            else:
+                idx = pitch_types.map(pt_index).fillna(global_idx).to_numpy(dtype=np.intp)
+            return to_stuff_plus(preds, idx)
+
+        return predict_fn
+
+    def predict_stuff_plus(self, X):
+        if self.model is None:
+            raise ValueError("Model must be trained before making predictions")
+        return self._predict_fn(X)
 
     def predict_single_pitch(
         self,
@@ -76,7 +346,6 @@ class aStuffPlusModel:
         fb_ivb,
         fb_hmov
     ):
-        import numpy as np
         if self.model is None:
             raise ValueError("Model must be trained before making predictions")
 
@@ -87,24 +356,61 @@ class aStuffPlusModel:
         adj_release_x = -release_pos_x if p_throws == 'L' else release_pos_x
         adj_spin_axis = 360 - spin_axis if p_throws == 'L' else spin_axis
 
-        feature_map = {
-            'release_speed': float(release_speed),
-            'pfx_z': float(pfx_z),
-            'adj_hmov': float(adj_hmov),
-            'release_spin_rate': float(release_spin_rate),
-            'adj_spin_axis': float(adj_spin_axis),
-            'release_extension': float(release_extension),
-            'release_pos_z': float(release_pos_z),
-            'adj_release_x': float(adj_release_x),
-            'velo_diff': float(velo_diff),
-            'ivb_diff': float(ivb_diff),
-            'hmov_diff': float(hmov_diff)
-        }
-
-        X_input = np.array([feature_map[f] for f in self.numeric_features], dtype=float).reshape(1, -1)
-        raw_pred = self.model.predict(X_input)[0]
-
-        scaler = self.scalers.get(pitch_type, self.global_scaler)
-        scaled = (raw_pred - scaler.mean_[0]) / scaler.scale_[0]
+        buf = self._single_buf()
+        buf[0, self._feature_cols] = (
+            release_speed, pfx_z, adj_hmov, release_spin_rate, adj_spin_axis, release_extension,
+            release_pos_z, adj_release_x, velo_diff, ivb_diff, hmov_diff
+        )
+        raw_pred = self.predict_raw(buf)[0]
+
+        idx = self._pt_index.get(pitch_type, self._global_idx)
+        scaled = (raw_pred - self._means[idx]) / self._scales[idx]
         stuff_plus = 100.0 + (scaled * 10.0)
-        return float(np.clip(stuff_plus, self.min_stuff, self.max_stuff))
+        # Value first so NaN passes through, as np.clip and _scale_and_clip do.
+        return float(min(max(stuff_plus, self._clip_lo), self._clip_hi))
+
+    def feature_matrix(self, raw, lefty):
+        # raw rows follow PITCH_INPUTS; lefty is a bool or a per-row bool array.
+        (release_speed, pfx_x, pfx_z, release_extension, release_spin_rate, spin_axis,
+         release_pos_x, release_pos_z, fb_velo, fb_ivb, fb_hmov) = raw.T
+        sign = np.where(lefty, -1.0, 1.0)
+
+        features = np.empty((len(raw), len(self.numeric_features)), dtype=np.float32)
+        for col, values in zip(self._feature_cols, (
+            release_speed,
+            pfx_z,
+            sign * pfx_x,
+            release_spin_rate,
+            np.where(lefty, 360 - spin_axis, spin_axis),
+            release_extension,
+            release_pos_z,
+            sign * release_pos_x,
+            release_speed - fb_velo,
+            pfx_z - fb_ivb,
+            pfx_x - fb_hmov,
+        )):
+            features[:, col] = values
+        return features
+
+    def predict_features(self, features, pitch_types):
+        # pitch_types is one code for every row or one per row.
+        if self.model is None:
+            raise ValueError("Model must be trained before making predictions")
+        preds = self.predict_raw(features)
+        if isinstance(pitch_types, str):
+            idx = np.full(len(preds), self._pt_index.get(pitch_types, self._global_idx), dtype=np.intp)
+        else:
+            idx = self._pitch_type_index(pitch_types)
+        return self._to_stuff_plus(preds, idx)
+
+    def predict_many(self, pitch_rows):
+        # pitch_rows are predict_single_pitch keyword dicts, scored in one model call.
+        if self.model is None:
+            raise ValueError("Model must be trained before making predictions")
+        if not pitch_rows:
+            return np.empty(0, dtype=np.float32)
+
+        raw = np.array(list(map(_get_pitch_inputs, pitch_rows)), dtype=float)
+        lefty = np.array(list(map(_get_p_throws, pitch_rows)), dtype=str) == 'L'
+        features = self.feature_matrix(raw, lefty)
+        return self.predict_features(features, list(map(_get_pitch_type, pitch_rows)))
@@ -0,0 +1,39 @@
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+# main reads its configuration at import time, so point it at a throwaway database first.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_PATH"] = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["JWT_SECRET"] = "test-secret-" + "x" * 32
+os.environ["SIGNUP_REQUIRES_PAYMENT"] = "0"
+os.environ["BCRYPT_COST"] = "4"
+
+import main  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+main.limiter.enabled = False
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(main.app) as c:
+        yield c
+
+
+@pytest.fixture
+def signup(client):
+    """Create a fresh account and return its auth headers."""
+    def _signup(account_type="personal"):
+        r = client.post("/auth/signup", json={
+            "email": f"{uuid.uuid4().hex}@example.com",
+            "name": "Test",
+            "password": "secret1",
+            "account_type": account_type,
+        })
+        assert r.status_code == 200, r.text
+        return {"Authorization": f"Bearer {r.json()['token']}"}
+    return _signup
@@ -0,0 +1,69 @@
+import sqlite3
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def legacy_db(tmp_path, monkeypatch):
+    """A database in the pre-profiles schema, with get_db pointed at it for the test."""
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE users (id TEXT PRIMARY KEY, email TEXT UNIQUE NOT NULL, name TEXT NOT NULL,
+                            password_hash TEXT NOT NULL, created_at TEXT NOT NULL);
+        CREATE TABLE pitches (id TEXT PRIMARY KEY, user_id TEXT NOT NULL, pitch_type TEXT NOT NULL,
+                              created_at TEXT NOT NULL);
+        INSERT INTO users VALUES ('u1', 'a@example.com', 'A', 'x', 'now'), ('u2', 'b@example.com', 'B', 'x', 'now');
+        INSERT INTO pitches VALUES ('p1', 'u1', 'FF', 'now'), ('p2', 'u1', 'SL', 'now'), ('p3', 'u2', 'CU', 'now');
+    """)
+    conn.close()
+
+    saved = getattr(main._db_local, "conn", None)
+    main._db_local.conn = None
+    monkeypatch.setattr(main, "DB_PATH", path)
+    yield path
+    if main._db_local.conn is not None:
+        main._db_local.conn.close()
+    main._db_local.conn = saved
+
+
+def _check_migrated(path):
+    conn = sqlite3.connect(path)
+    users = {row[1] for row in conn.execute("PRAGMA table_info(users)")}
+    assert {"account_type", "subscription_status", "revenuecat_app_user_id"} <= users
+    assert conn.execute("SELECT user_id, COUNT(*) FROM profiles GROUP BY user_id ORDER BY user_id").fetchall() == [
+        ("u1", 1), ("u2", 1),
+    ]
+    assert conn.execute("""SELECT COUNT(*) FROM pitches
+                           JOIN profiles ON profiles.id = pitches.profile_id
+                           AND profiles.user_id = pitches.user_id""").fetchone()[0] == 3
+    conn.close()
+
+
+def test_migrate_db_twice(legacy_db):
+    main.init_db()
+    _check_migrated(legacy_db)
+    main.init_db()
+    _check_migrated(legacy_db)
+    with main.get_db() as conn:
+        assert conn.execute("SELECT name FROM temp.sqlite_master WHERE name = 'bootstrap_users'").fetchone() is None
+
+
+def test_migrate_db_tolerates_columns_added_concurrently(legacy_db, monkeypatch):
+    main.init_db()
+    # Another worker added every column between our PRAGMA check and the ALTER.
+    monkeypatch.setattr(main, "_table_columns", lambda conn, table: set())
+    main.migrate_db()
+    _check_migrated(legacy_db)
+
+
+def test_migrate_db_recovers_from_failed_bootstrap(legacy_db, monkeypatch):
+    monkeypatch.setattr(main, "_now_iso", lambda: None)  # profiles.created_at is NOT NULL
+    with pytest.raises(sqlite3.IntegrityError):
+        main.init_db()
+    monkeypatch.undo()
+    monkeypatch.setattr(main, "DB_PATH", legacy_db)
+    main.init_db()
+    _check_migrated(legacy_db)
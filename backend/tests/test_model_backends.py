@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+import xgboost as xgb
+from sklearn.preprocessing import StandardScaler
+
+from modeling.aStuffPlusModel2 import aStuffPlusModel
+
+
+def _make_model(seed=0):
+    rng = np.random.default_rng(seed)
+    model = aStuffPlusModel()
+    X = rng.normal(size=(500, len(model.numeric_features))).astype(np.float32)
+    model.model = xgb.XGBRegressor(n_estimators=20, max_depth=4).fit(X, X[:, 0] + rng.normal(size=500))
+    for pt in ("FF", "SL", "CU"):
+        model.scalers[pt] = StandardScaler().fit(rng.normal(size=(50, 1)))
+    model.global_scaler = StandardScaler().fit(rng.normal(size=(50, 1)))
+    model._prepare()
+    return model
+
+
+@pytest.fixture
+def model():
+    return _make_model()
+
+
+@pytest.fixture
+def features(model):
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(256, len(model.numeric_features))).astype(np.float32)
+    X[::17, 3] = np.nan
+    return X
+
+
+def test_tl2cgen_matches_xgboost(model, features, tmp_path):
+    pytest.importorskip("tl2cgen")
+    expected = model.predict_raw(features)
+    assert model.compile_predictor(str(tmp_path / "model.json"))
+    np.testing.assert_allclose(model.predict_raw(features), expected, rtol=1e-5, atol=1e-5)
+
+
+def test_numba_kernel_matches_numpy(model):
+    pytest.importorskip("numba")
+    from modeling.aStuffPlusModel2 import FUSED_MIN_ROWS, _scale_and_clip
+    assert _scale_and_clip is not None
+
+    rng = np.random.default_rng(2)
+    n = FUSED_MIN_ROWS + 3
+    preds = rng.normal(scale=20, size=n).astype(np.float32)  # wide enough to hit both clip bounds
+    preds[::101] = np.nan
+    idx = rng.integers(0, len(model._means), size=n).astype(np.intp)
+    expected = np.clip(
+        100.0 + ((preds - model._means[idx]) / model._scales[idx]) * 10.0, model._clip_lo, model._clip_hi
+    )
+    out = model._to_stuff_plus(preds, idx)
+    assert np.nanmin(out) == model.min_stuff and np.nanmax(out) == model.max_stuff
+    np.testing.assert_allclose(out, expected, rtol=1e-6, equal_nan=True)
+
+
+def test_onnx_matches_xgboost(model, features, tmp_path):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("onnxmltools")
+    expected = model.predict_raw(features)
+    path = str(tmp_path / "model.onnx")
+    model.export_onnx(path)
+    assert model.load_onnx(path)
+    np.testing.assert_allclose(model.predict_raw(features), expected, rtol=1e-5, atol=1e-5)
+
+
+def test_onnx_from_another_booster_is_ignored(model, features, tmp_path):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("onnxmltools")
+    path = str(tmp_path / "model.onnx")
+    _make_model(seed=3).export_onnx(path)
+    assert not model.load_onnx(path)
+    assert model._ort_session is None
+
+
+def test_single_pitch_clips_like_batch_paths(model, monkeypatch):
+    raw = np.array([np.nan, -50.0, 0.0, 50.0], dtype=np.float32)
+    inputs = dict(
+        release_speed=84.0, pfx_x=0.5, pfx_z=0.1, release_extension=6.2, release_spin_rate=2500,
+        spin_axis=90, release_pos_x=-1.8, release_pos_z=5.8, p_throws="R", fb_velo=93.0, fb_ivb=1.3, fb_hmov=-0.7,
+    )
+    for value in raw:
+        monkeypatch.setattr(model, "predict_raw", lambda features, value=value: np.full(len(features), value, np.float32))
+        single = model.predict_single_pitch("SL", **inputs)
+        batch = model.predict_features(np.zeros((1, len(model.numeric_features)), np.float32), "SL")
+        np.testing.assert_array_equal([single], batch)
@@ -0,0 +1,37 @@
+def _profile_id(client, headers):
+    return client.get("/profiles", headers=headers).json()[0]["id"]
+
+
+def test_save_pitch_defaults_to_own_profile(client, signup):
+    headers = signup()
+    r = client.post("/pitches", json={"pitch_type": "SL", "pitch_speed": 84.0}, headers=headers)
+    assert r.status_code == 201
+    pitches = client.get(f"/pitches?profile_id={_profile_id(client, headers)}", headers=headers).json()
+    assert [p["id"] for p in pitches] == [r.json()["id"]]
+
+
+def test_save_pitch_to_own_profile(client, signup):
+    headers = signup()
+    r = client.post("/pitches", json={"pitch_type": "FF", "profile_id": _profile_id(client, headers)}, headers=headers)
+    assert r.status_code == 201
+
+
+def test_save_pitch_to_other_users_profile_is_forbidden(client, signup):
+    owner, intruder = signup(), signup()
+    r = client.post("/pitches", json={"pitch_type": "FF", "profile_id": _profile_id(client, owner)}, headers=intruder)
+    assert r.status_code == 403
+    assert client.get("/pitches", headers=owner).json() == []
+    assert client.get("/pitches", headers=intruder).json() == []
+
+
+def test_save_pitch_to_unknown_profile_is_forbidden(client, signup):
+    headers = signup()
+    r = client.post("/pitches", json={"pitch_type": "FF", "profile_id": "nope"}, headers=headers)
+    assert r.status_code == 403
+    assert client.get("/pitches", headers=headers).json() == []
+
+
+def test_list_other_users_profile_is_forbidden(client, signup):
+    owner, intruder = signup(), signup()
+    r = client.get(f"/pitches?profile_id={_profile_id(client, owner)}", headers=intruder)
+    assert r.status_code == 403
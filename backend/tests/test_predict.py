@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+import main
+from modeling.aStuffPlusModel2 import PITCH_INPUTS
+
+PITCH = dict(
+    pitch_type="SL", release_speed=84.0, pfx_x=0.5, pfx_z=0.1, release_extension=6.2,
+    release_spin_rate=2500, spin_axis=90, release_pos_x=-1.8, release_pos_z=5.8,
+    p_throws="R", fb_velo=93.0, fb_ivb=1.3, fb_hmov=-0.7,
+)
+
+
+def _reference_penalty(pitch_type, avg_velo, pfx_z_inches, stuff_val):
+    # The original branch-per-type implementation the lookup table replaced.
+    penalty = 0
+    capped_stuff = stuff_val
+    if pfx_z_inches > 17:
+        pitch_type = "FF"
+    if pitch_type in ("FF", "SI"):
+        penalty = max(0, 93 - avg_velo)
+        if avg_velo < 90:
+            capped_stuff = min(capped_stuff, 105)
+    elif pitch_type in ("CU", "KC", "ST"):
+        penalty = max(0, 75 - avg_velo)
+    elif pitch_type in ("SL", "FC"):
+        penalty = max(0, 82 - avg_velo)
+    elif pitch_type in ("CH", "SP", "FS"):
+        penalty = max(0, 78 - avg_velo)
+    penalty = min(30, penalty)
+    return capped_stuff - penalty, penalty
+
+
+@pytest.mark.parametrize("pitch_type", ["FF", "SI", "CU", "KC", "ST", "SL", "FC", "CH", "SP", "FS", "KN", "EP"])
+def test_velocity_penalty_matches_reference(pitch_type):
+    velos = np.array([40.0, 60.0, 74.5, 75.0, 81.0, 82.0, 89.9, 90.0, 93.0, 99.0])
+    for ivb in (-10.0, 17.0, 17.1):
+        for stuff in (80.0, 104.0, 120.0):
+            expected = [_reference_penalty(pitch_type, v, ivb, stuff) for v in velos]
+            assert [main.velocity_penalty(pitch_type, v, ivb, stuff) for v in velos] == pytest.approx(expected)
+            batch = main.velocity_penalty_batch(pitch_type, velos, np.full(len(velos), ivb), np.full(len(velos), stuff))
+            assert batch == pytest.approx([e[0] for e in expected])
+
+
+def test_predict_ok(client, signup):
+    r = client.post("/predict", json=PITCH, headers=signup())
+    assert r.status_code == 200
+    assert 60 <= r.json()["stuff_plus"] <= 140
+
+
+@pytest.mark.parametrize("field,value", [("pitch_type", "XX"), ("pitch_type", "sl"), ("p_throws", "S")])
+def test_predict_rejects_unknown_codes(client, signup, field, value):
+    r = client.post("/predict", json=dict(PITCH, **{field: value}), headers=signup())
+    assert r.status_code == 422
+
+
+def test_signup_rejects_unknown_account_type(client):
+    r = client.post("/auth/signup", json={
+        "email": "enterprise@example.com", "name": "E", "password": "secret1", "account_type": "enterprise",
+    })
+    assert r.status_code == 422
+
+
+@pytest.mark.parametrize("p_throws", ["R", "L"])
+@pytest.mark.parametrize("pitch_type", ["FF", "SL", "CU", "XX"])
+def test_single_pitch_path_matches_batch(client, pitch_type, p_throws):
+    if main.model_college is None:
+        pytest.skip("Stuff+ model not available")
+    rng = np.random.default_rng(0)
+    base = np.array([PITCH[k] for k in PITCH_INPUTS])
+    X = base + rng.normal(scale=0.1, size=(20, len(base))) * np.maximum(np.abs(base), 1)
+    batch = main._predict_batch(pitch_type, p_throws, X)
+    single = [main._predict_single(pitch_type, p_throws, tuple(row)) for row in X]
+    assert single == batch.tolist()